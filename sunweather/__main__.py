@@ -7,85 +7,247 @@
 """
 
 from __future__ import annotations
-import argparse, asyncio, logging, pathlib, re, tempfile, subprocess, os, shutil
-from typing import Final, Dict, List
+import argparse, asyncio, contextlib, io, itertools, logging, pathlib, queue, re, subprocess, os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate, parsedate_to_datetime
+from functools import partial
+from typing import Final, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from urllib.parse import urljoin
 
 import httpx
-from PIL import Image
+from PIL import Image, features
 import numpy as np
-from tqdm.asyncio import tqdm_asyncio
 from tqdm import tqdm
 
+try:                                    # optional: C HTML parser for listings
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    HTMLParser = None
+try:                                    # optional: libuv event loop
+    import uvloop
+except ImportError:
+    uvloop = None
+try:                                    # optional: faster PNG decode via libvips
+    import pyvips
+except (ImportError, OSError):          # OSError: binding present, libvips missing
+    pyvips = None
+
 # ─── constants ──────────────────────────────────────────────────────────────
 BANDS:      Final[List[str]]  = ["094", "131", "171", "195", "284", "304"]
 GRID_ORDER: Final[List[str]]  = BANDS[:]
 BASE_URL:   Final[str]        = "https://services.swpc.noaa.gov/images/animations/suvi/primary/"
 HREF_RE:    Final[re.Pattern] = re.compile(r'href="(or_suvi-[^"]+\.png)"')
+STAMP_RE:   Final[re.Pattern] = re.compile(r"_s(\d{8})T(\d{6})")
 HEADERS                     = {
     "referer":    "https://www.swpc.noaa.gov/",
     "user-agent": "Mozilla/5.0 (+SUVI-grid-AVI)",
 }
 FFMPEG_OPTS = ["ffmpeg", "-y", "-hide_banner", "-loglevel", "error"]
+CHUNK_SIZE: Final[int]        = 64 * 1024
+TIMEOUT:    Final             = httpx.Timeout(connect=10, read=30, write=30, pool=None)
+QUANTIZER:  Final             = (              # pngquant's engine, when Pillow has it
+    Image.Quantize.LIBIMAGEQUANT if features.check_feature("libimagequant")
+    else Image.Quantize.MEDIANCUT
+)
+
+Tile = Union[pathlib.Path, bytes]                   # on-disk (--keep) or in-memory PNG
 
 # ─── helpers: scraping & downloading ────────────────────────────────────────
-def scrape_band(band: str) -> List[str]:
+def make_client(concurrency: int = 32) -> httpx.AsyncClient:
+    """One HTTP/2 client for the listings and every tile on the SWPC origin,
+    so all requests share a connection and its HPACK header table."""
+    limits = httpx.Limits(
+        max_connections=concurrency,
+        max_keepalive_connections=concurrency,
+        keepalive_expiry=30.0,
+    )
+    return httpx.AsyncClient(
+        http2=True, headers=HEADERS, limits=limits, timeout=TIMEOUT,
+        follow_redirects=True,
+    )
+
+def _start_time(rel: str) -> Tuple[int, str]:
+    """Sort key: the ``_sYYYYMMDDTHHMMSS`` start stamp as an int, name as tiebreak."""
+    m = STAMP_RE.search(rel)
+    return (int(m[1] + m[2]) if m else -1, rel)
+
+async def scrape_band(client, band: str) -> List[str]:
     """Return sorted PNG URLs for a wavelength band."""
-    url = f"{BASE_URL}{band}/"
-    text = httpx.get(url, headers=HEADERS, timeout=30).text
-    rels = [m for m in HREF_RE.findall(text) if m.startswith("or_suvi")]
-    rels.sort()                                      # ISO timestamp = lexical
+    r    = await client.get(f"{BASE_URL}{band}/")
+    url  = str(r.url)                                # post-redirect base for hrefs
+    text = r.text
+    if HTMLParser is not None:
+        hrefs = (a.attributes.get("href") or "" for a in HTMLParser(text).css("a[href]"))
+        rels  = [h for h in hrefs if h.startswith("or_suvi-") and h.endswith(".png")]
+    else:
+        rels  = HREF_RE.findall(text)
+    rels.sort(key=_start_time)
     return [urljoin(url, rel) for rel in rels]
 
-async def _grab(client, url: str, dest: pathlib.Path, tries: int, strict: bool):
+async def _grab(
+    client, slots: asyncio.Semaphore, url: str, dest: Optional[pathlib.Path],
+    tries: int, strict: bool,
+) -> Optional[Tile]:
+    """Fetch one tile: to *dest* if given (--keep), else into memory.
+
+    *slots* caps requests in flight; HTTP/2 multiplexes them all onto one
+    connection, so the pool's connection limit alone doesn't bound them."""
+    name  = url.rsplit("/", 1)[-1]
     delay = 2.0
+    part  = dest and dest.with_name(dest.name + ".part")
     for attempt in range(1, tries + 1):
+        headers = {}
+        if dest and dest.exists():                   # --keep: revalidate only
+            headers["if-modified-since"] = formatdate(dest.stat().st_mtime, usegmt=True)
         try:
-            r = await client.get(url, timeout=30+delay)
-            r.raise_for_status()
-            dest.write_bytes(r.content)
-            return
-        except (httpx.HTTPStatusError, httpx.ProtocolError):
+            async with slots, client.stream("GET", url, headers=headers) as r:
+                if r.status_code == 304:
+                    return dest
+                r.raise_for_status()
+                if dest is None:
+                    return await r.aread()
+                with part.open("wb") as f:
+                    async for chunk in r.aiter_bytes(CHUNK_SIZE):
+                        f.write(chunk)
+            part.replace(dest)
+            lm = r.headers.get("last-modified")
+            with contextlib.suppress(ValueError, TypeError):   # malformed → keep local mtime
+                ts = parsedate_to_datetime(lm).timestamp()
+                os.utime(dest, (ts, ts))             # next run compares server times
+            return dest
+        except (httpx.HTTPStatusError, httpx.TransportError):   # incl. mid-body read errors
             if attempt == tries:
+                if dest and dest.exists():           # revalidation failed; cached copy stands
+                    logging.warning("Keeping cached %s", name)
+                    return dest
                 if strict:
-                    raise RuntimeError(f"Give-up {dest.name} after {tries} tries")
-                logging.warning("Skipping %s", dest.name)
-                return
+                    raise RuntimeError(f"Give-up {name} after {tries} tries")
+                logging.warning("Skipping %s", name)
+                return None
             await asyncio.sleep(delay)
             delay *= 2
+        finally:
+            if part:
+                part.unlink(missing_ok=True)         # no half-written tiles
+
+async def _into(row: Dict[str, Tile], band: str, grab) -> None:
+    if (tile := await grab) is not None:
+        row[band] = tile
 
-async def download_all(
+def download_all(
+    client,
     url_matrix: Dict[str, List[str]],
-    outdir: pathlib.Path,
+    outdir: Optional[pathlib.Path],
     tries: int,
     strict: bool,
-) -> Dict[int, Dict[str, pathlib.Path]]:
-    meta: Dict[int, Dict[str, pathlib.Path]] = {}
-    outdir.mkdir(parents=True, exist_ok=True)
-    tasks = []
-    async with httpx.AsyncClient(http2=True, headers=HEADERS) as client:
-        for band, urls in url_matrix.items():
-            for idx, url in enumerate(urls):
-                dest = outdir / f"{band}_{idx}.png"
-                meta.setdefault(idx, {})[band] = dest
-                tasks.append(_grab(client, url, dest, tries, strict))
-        await tqdm_asyncio.gather(*tasks, desc="Downloading", unit="img")
-    return meta
+    concurrency: int = 32,
+) -> Tuple[Dict[int, Dict[str, Tile]], Dict[int, asyncio.Future]]:
+    """Start every tile download; return the tile table (filled in as tiles
+    land) and one future per frame."""
+    meta: Dict[int, Dict[str, Tile]] = {}
+    if outdir:
+        outdir.mkdir(parents=True, exist_ok=True)
+    per_row: Dict[int, list] = {}
+    slots = asyncio.Semaphore(concurrency)
+    bar = tqdm(total=sum(map(len, url_matrix.values())), desc="Downloading", unit="img")
+    # frame-major order: the semaphore is FIFO, so early frames finish first
+    for idx, urls in enumerate(zip(*url_matrix.values())):
+        for band, url in zip(url_matrix, urls):
+            dest = outdir / url.rsplit("/", 1)[-1] if outdir else None
+            grab = _grab(client, slots, url, dest, tries, strict)
+            task = asyncio.ensure_future(_into(meta.setdefault(idx, {}), band, grab))
+            task.add_done_callback(lambda t: t.cancelled() or bar.update())
+            per_row.setdefault(idx, []).append(task)
+    rows = {idx: asyncio.gather(*tasks) for idx, tasks in per_row.items()}
+    done = asyncio.gather(*rows.values(), return_exceptions=True)
+    done.add_done_callback(lambda _: bar.close())
+    return meta, rows
+
+async def fetch_rows(
+    frames: Optional[int],
+    outdir: Optional[pathlib.Path],
+    tries: int,
+    strict: bool,
+    concurrency: int,
+    emit: Callable[[Dict[str, Tile]], None],
+):
+    """Scrape every band listing, download the last *frames* tiles and
+    *emit* each gap-filled row as soon as its tiles have landed."""
+    async with make_client(concurrency) as client:
+        listings = await asyncio.gather(*(scrape_band(client, b) for b in BANDS))
+        per_band = dict(zip(BANDS, listings))
+        min_len  = min(map(len, per_band.values()))
+        use_len  = min(frames or min_len, min_len)
+        logging.info("Using last %d frames (min=%d)", use_len, min_len)
+
+        urls = {b: lst[-use_len:] for b, lst in per_band.items()}
+        meta, rows = download_all(client, urls, outdir, tries, strict, concurrency)
+        try:
+            for i in range(use_len):
+                await rows[i]
+                for band in GRID_ORDER:
+                    if band not in meta[i]:
+                        tile = await nearest_tile(i, band, meta, rows)
+                        if tile is None:
+                            if strict:
+                                raise RuntimeError(f"Missing {band}_{i}")
+                            break
+                        meta[i][band] = tile
+                else:
+                    emit(meta[i])
+        finally:
+            for row in rows.values():
+                row.cancel()
 
 # ─── helpers: gap-fill & grid composition ───────────────────────────────────
-def nearest_tile(idx: int, band: str, table):
+async def nearest_tile(idx: int, band: str, table, rows) -> Optional[Tile]:
     for j in range(idx, -1, -1):
-        p = table.get(j, {}).get(band)
-        if p and p.exists():
-            return p
+        t = table.get(j, {}).get(band)
+        if t is not None:
+            return t
     for j in range(idx + 1, max(table) + 1):
-        p = table.get(j, {}).get(band)
-        if p and p.exists():
-            return p
+        await rows[j]                                # later frame may still be in flight
+        t = table.get(j, {}).get(band)
+        if t is not None:
+            return t
     return None
 
-def compose_grid(row: Dict[str, pathlib.Path]) -> Image.Image:
-    imgs = [Image.open(row[b]).convert("RGB") for b in GRID_ORDER]
+def open_tile(tile: Tile) -> Image.Image:
+    """Open a tile kept on disk (--keep) or held in memory."""
+    if pyvips is not None:
+        return _vips_decode(tile)
+    img = Image.open(io.BytesIO(tile) if isinstance(tile, bytes) else tile)
+    if img.mode.startswith("I"):                     # 16-bit grey → high byte, as vips does
+        return Image.fromarray((np.asarray(img) >> 8).astype(np.uint8))
+    return img
+
+def _vips_decode(tile: Tile) -> Image.Image:
+    """Decode with libvips (libspng, SIMD inflate); Pillow only wraps the pixels."""
+    if isinstance(tile, bytes):
+        v = pyvips.Image.new_from_buffer(tile, "")
+    else:
+        v = pyvips.Image.new_from_file(str(tile), access="sequential")
+    if v.format != "uchar":                          # 16-bit → 8-bit sRGB (high byte)
+        v = v.colourspace("srgb")
+    arr = np.ndarray(buffer=v.write_to_memory(), dtype=np.uint8,
+                     shape=(v.height, v.width, v.bands))
+    return Image.fromarray(arr[..., 0] if v.bands == 1 else arr)
+
+def stretch(img: Image.Image, lo_pct: float = 1, hi_pct: float = 99) -> Image.Image:
+    """Map the *lo_pct*–*hi_pct* percentile range onto 0–255 via one NumPy LUT."""
+    a    = np.asarray(img, dtype=np.uint8)
+    cdf  = np.bincount(a.ravel(), minlength=256).cumsum()
+    lo, hi = np.searchsorted(cdf, [cdf[-1] * lo_pct / 100, cdf[-1] * hi_pct / 100])
+    if hi <= lo:
+        return img
+    lut = np.clip((np.arange(256) - lo) * 255 // (hi - lo), 0, 255).astype(np.uint8)
+    return Image.fromarray(lut[a])
+
+def compose_grid(row: Dict[str, Tile], normalize: bool = False) -> Image.Image:
+    imgs = [open_tile(row[b]).convert("RGB") for b in GRID_ORDER]
+    if normalize:
+        imgs = [stretch(img) for img in imgs]
     w, h = imgs[0].size
     canvas = Image.new("RGB", (w * 3, h * 2))
     for i, img in enumerate(imgs):
@@ -93,27 +255,56 @@ def compose_grid(row: Dict[str, pathlib.Path]) -> Image.Image:
         canvas.paste(img, (c * w, r * h))
     return canvas
 
+def imap_ordered(pool, fn, items, ahead: int) -> Iterator:
+    """Like ``pool.map`` but with at most *ahead* results held at once."""
+    pending: Deque = deque()
+    for item in items:
+        pending.append(pool.submit(fn, item))
+        if len(pending) >= ahead:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
 # ─── encoding helpers ───────────────────────────────────────────────────────
-def encode_avi(frames: List[Image.Image], outfile: pathlib.Path, fps: int, verbose: bool = False):
-    """Encode PNG frames → Xvid-AVI (fast)."""
-    tmp = pathlib.Path(tempfile.mkdtemp())
+def encode_avi(frames: Iterable[Image.Image], outfile: pathlib.Path, fps: int, verbose: bool = False):
+    """Pipe raw RGB frames → Xvid-AVI (fast), one frame at a time.
+
+    ffmpeg writes to a ``.part`` sibling that only replaces *outfile* once it
+    exits cleanly, so an aborted run never leaves a truncated video behind."""
+    frames = iter(frames)
+    first  = next(frames)
+    w, h   = first.size
+    part   = outfile.with_name(f"{outfile.stem}.part{outfile.suffix}")  # ffmpeg muxes by suffix
+    ffmpeg_command = [
+            *FFMPEG_OPTS[slice(verbose and 2 or None)],
+            "-f", "rawvideo",
+            "-pix_fmt", "rgb24",
+            "-video_size", f"{w}x{h}",
+            "-framerate", str(fps),
+            "-i", "-",
+            "-c:v", "mpeg4",
+            "-vtag", "xvid",
+            "-q:v",  "2",
+            str(part),
+    ]
+    logging.debug(f"{ffmpeg_command=}")
+    proc = subprocess.Popen(ffmpeg_command, stdin=subprocess.PIPE)
     try:
-        for i, img in enumerate(tqdm(frames, desc="PNG→seq", unit="img")):
-            img.save(tmp / f"f{i:05d}.png")
-        
-        ffmpeg_command = [
-                *FFMPEG_OPTS[slice(verbose and 2 or None)],
-                "-framerate", str(fps),
-                "-i", str(tmp / "f%05d.png"),
-                "-c:v", "mpeg4",
-                "-vtag", "xvid",
-                "-q:v",  "2",
-                str(outfile),
-        ]
-        logging.debug(f"{ffmpeg_command=}")
-        subprocess.run(ffmpeg_command, check=True)
-    finally:
-        shutil.rmtree(tmp)
+        for n, img in enumerate(itertools.chain([first], frames)):
+            if img.size != (w, h):                   # rawvideo has no per-frame size
+                raise ValueError(f"frame {n} is {img.width}x{img.height}, expected {w}x{h}")
+            proc.stdin.write(img.tobytes())
+        proc.stdin.close()
+        if proc.wait():
+            raise subprocess.CalledProcessError(proc.returncode, ffmpeg_command)
+    except BaseException:
+        proc.kill()                                  # don't let ffmpeg finalize a short file
+        with contextlib.suppress(OSError):
+            proc.stdin.close()
+        proc.wait()
+        part.unlink(missing_ok=True)
+        raise
+    part.replace(outfile)
 
 def encode_mp4_from_avi(avi_file: pathlib.Path, mp4_file: pathlib.Path, verbose: bool = False):
     """Re-encode AVI → MP4 (libx264 CRF-18 slow)."""
@@ -129,16 +320,96 @@ def encode_mp4_from_avi(avi_file: pathlib.Path, mp4_file: pathlib.Path, verbose:
     logging.debug(f"{ffmpeg_command=}")
     subprocess.run(ffmpeg_command, check=True)
 
-def build_gif(frames, outfile: pathlib.Path, fps: int):
-    frames[0].save(
-        outfile,
-        save_all=True,
-        append_images=frames[1:],
-        duration=int(1000 / fps),
-        loop=0,
-        optimize=True,
-        disposal=2,
-    )
+def build_gif(frames: Iterable[Image.Image], outfile: pathlib.Path, fps: int, colors: int = 256):
+    """Quantize the first frame once and remap the rest onto its palette.
+
+    Frames are pulled while the pipeline is still downloading, so the GIF is
+    written to a ``.part`` sibling and only replaces *outfile* on success."""
+    frames = iter(frames)
+    master = next(frames).quantize(colors=colors, method=QUANTIZER)
+    rest   = (f.quantize(palette=master, dither=Image.Dither.NONE) for f in frames)
+    part   = outfile.with_name(f"{outfile.stem}.part{outfile.suffix}")
+    try:
+        master.save(
+            part,
+            format="GIF",
+            save_all=True,
+            append_images=rest,
+            duration=int(1000 / fps),
+            loop=0,
+            optimize=True,
+            disposal=1,                 # keep previous frame → only diffs encoded
+            palette=master.getpalette(),  # one global palette, no per-frame tables
+        )
+    except BaseException:
+        part.unlink(missing_ok=True)
+        raise
+    part.replace(outfile)
+
+# ─── pipeline: download → compose → encode ──────────────────────────────────
+def _drain(q: queue.Queue) -> Iterator[Dict[str, Tile]]:
+    """Yield rows from *q* until the producer's ``None`` (or re-raise its error)."""
+    while (row := q.get()) is not None:
+        if isinstance(row, BaseException):
+            raise row
+        yield row
+
+def render(rows: Iterator[Dict[str, Tile]], args):
+    """Compose grids on a thread pool and stream them into the chosen encoder."""
+    head = list(itertools.islice(rows, 2))
+    if len(head) < 2:
+        raise SystemExit("Not enough frames to encode.")
+    rows = itertools.chain(head, rows)
+
+    workers = os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        grids = tqdm(
+            imap_ordered(pool, partial(compose_grid, normalize=args.normalize),
+                         rows, ahead=2 * workers),
+            desc="Composing", unit="frame",
+        )
+        suffix = args.output.suffix.lower()
+        if suffix == ".gif":
+            build_gif(grids, args.output, args.fps, args.colors)
+        elif suffix == ".mp4":
+            avi_tmp = args.output.with_suffix(".avi")
+            try:
+                encode_avi(grids, avi_tmp, args.fps, verbose=args.debug)
+                encode_mp4_from_avi(avi_tmp, args.output, verbose=args.debug)
+            finally:
+                if not args.keep_avi:
+                    avi_tmp.unlink(missing_ok=True)
+        else:  # fallback: raw AVI
+            encode_avi(grids, args.output, args.fps, verbose=args.debug)
+
+async def _produce(q: queue.Queue, args, workdir: Optional[pathlib.Path]):
+    """Feed gap-filled rows to *q*, then ``None`` – or the error that stopped us."""
+    try:
+        await fetch_rows(args.frames, workdir, args.retries, args.strict,
+                         args.concurrency, q.put)
+    except BaseException as exc:
+        q.put(exc)                                   # unblock & stop the encoder
+        raise
+    q.put(None)
+
+async def pipeline(args, workdir: Optional[pathlib.Path]):
+    """Overlap the stages: rows go to the encoder thread as their tiles land,
+    so wallclock ≈ max(download, compose, encode) instead of the sum."""
+    q: queue.Queue = queue.Queue()
+    # a plain executor future, not a Task: a SystemExit from render() is stored
+    # on it like any other error instead of escaping the event loop unretrieved
+    encoder = asyncio.get_running_loop().run_in_executor(None, render, _drain(q), args)
+    fetch   = asyncio.ensure_future(_produce(q, args, workdir))
+    try:
+        await asyncio.wait({fetch, encoder}, return_when=asyncio.FIRST_EXCEPTION)
+    finally:
+        fetch.cancel()                               # encoder died → stop downloading
+        q.put(asyncio.CancelledError())              # …and never leave it blocked
+        await asyncio.wait({fetch, encoder})
+    errors = [t.exception() for t in (fetch, encoder) if not t.cancelled()]
+    for exc in errors:                               # the download error wins
+        if exc is not None:
+            raise exc
 
 # ─── main ───────────────────────────────────────────────────────────────────
 def main():
@@ -147,61 +418,30 @@ def main():
                    default=pathlib.Path("suvi_grid.mp4"))
     p.add_argument("--fps",      type=int, default=20)
     p.add_argument("--frames",   type=int)
+    p.add_argument("--colors",   type=int, default=256, help="GIF palette size (2-256)")
     p.add_argument("--retries",  type=int, default=3)
+    p.add_argument("--concurrency", type=int, default=32,
+                   help="max simultaneous downloads")
+    p.add_argument("--normalize", action="store_true",
+                   help="stretch each tile's 1-99th percentile to full range")
     p.add_argument("--keep",     action="store_true", help="keep PNG frames dir")
     p.add_argument("--keep-avi", action="store_true", help="keep intermediate AVI")
     p.add_argument("--strict",   action="store_true")
     p.add_argument("--debug",    action="store_true")
     args = p.parse_args()
+    if not 2 <= args.colors <= 256:
+        p.error("--colors must be between 2 and 256")
+    if args.concurrency < 1:
+        p.error("--concurrency must be at least 1")
 
     logging.basicConfig(
         level=logging.DEBUG if args.debug else logging.WARN,
         format="%(levelname)s: %(message)s",
     )
 
-    # 1. scrape listings
-    per_band = {b: scrape_band(b) for b in BANDS}
-    min_len  = min(map(len, per_band.values()))
-    use_len  = min(args.frames or min_len, min_len)
-    logging.info("Using last %d frames (min=%d)", use_len, min_len)
-
-    # 2. URLs to grab
-    urls = {b: lst[-use_len:] for b, lst in per_band.items()}
-
-    # 3. download PNGs
-    workdir = pathlib.Path("frames") if args.keep else pathlib.Path(tempfile.mkdtemp())
-    meta    = asyncio.run(download_all(urls, workdir, args.retries, args.strict))
-
-    # 4. compose grids
-    grids: List[Image.Image] = []
-    for i in tqdm(range(use_len), desc="Composing", unit="frame"):
-        for band in GRID_ORDER:
-            pth = meta[i].get(band)
-            if not pth or not pth.exists():
-                pth = nearest_tile(i, band, meta)
-                if not pth:
-                    if args.strict:
-                        raise RuntimeError(f"Missing {band}_{i}")
-                    break
-                meta[i][band] = pth
-        else:
-            grids.append(compose_grid(meta[i]))
-
-    if len(grids) < 2:
-        raise SystemExit("Not enough frames to encode.")
-
-    # 5. encode path logic
-    suffix = args.output.suffix.lower()
-    if suffix == ".gif":
-        build_gif(grids, args.output, args.fps)
-    elif suffix == ".mp4":
-        avi_tmp = args.output.with_suffix(".avi")
-        encode_avi(grids, avi_tmp, args.fps, verbose=args.debug)
-        encode_mp4_from_avi(avi_tmp, args.output, verbose=args.debug)
-        if not args.keep_avi:
-            avi_tmp.unlink(missing_ok=True)
-    else:  # fallback: raw AVI
-        encode_avi(grids, args.output, args.fps, verbose=args.debug)
+    workdir = pathlib.Path("frames") if args.keep else None     # None → in memory
+    run = uvloop.run if uvloop is not None else asyncio.run
+    run(pipeline(args, workdir))
 
     logging.debug("Saved → %s", args.output.resolve())
     print(f"Saved → {args.output.resolve()}")
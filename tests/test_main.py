@@ -0,0 +1,294 @@
+import asyncio
+import io
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import httpx
+import numpy as np
+import pytest
+from PIL import Image
+
+import sunweather.__main__ as sw
+
+
+# ─── scraping ───────────────────────────────────────────────────────────────
+def test_start_time_orders_by_timestamp_not_satellite():
+    names = [
+        "or_suvi-l2-ci094_g19_s20250101T001000Z_e20250101T001400Z_v1-0-2.png",
+        "or_suvi-l2-ci094_g18_s20250101T002000Z_e20250101T002400Z_v1-0-2.png",
+        "or_suvi-l2-ci094_g19_s20241231T235000Z_e20241231T235400Z_v1-0-2.png",
+    ]
+    assert sorted(names, key=sw._start_time) == [names[2], names[0], names[1]]
+
+
+def test_start_time_puts_unstamped_names_first():
+    assert sw._start_time("or_suvi-latest.png") < sw._start_time(
+        "or_suvi-l2-ci094_g19_s20250101T000000Z_e_v1.png"
+    )
+
+
+# ─── grid composition ───────────────────────────────────────────────────────
+def test_stretch_maps_percentiles_to_full_range():
+    a = np.tile(np.arange(50, 150, dtype=np.uint8), (100, 1))
+    out = np.asarray(sw.stretch(Image.fromarray(a)))
+    assert out.min() == 0 and out.max() == 255
+    assert (np.diff(out[0].astype(int)) >= 0).all()       # monotonic
+
+
+def test_stretch_leaves_flat_images_alone():
+    img = Image.new("RGB", (8, 8), (40, 40, 40))
+    assert sw.stretch(img) is img
+
+
+def test_imap_ordered_keeps_order_and_bounds_lookahead():
+    held = peak = 0
+    lock = threading.Lock()
+
+    def work(i):
+        nonlocal held, peak
+        with lock:
+            held += 1
+            peak = max(peak, held)
+        time.sleep(0.001 * (i % 3))
+        return i
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        out = []
+        for i in sw.imap_ordered(pool, work, range(40), ahead=3):
+            out.append(i)
+            with lock:
+                held -= 1
+    assert out == list(range(40))
+    assert peak <= 3
+
+
+def _done(result=None):
+    fut = asyncio.get_running_loop().create_future()
+    fut.set_result(result)
+    return fut
+
+
+def test_nearest_tile_prefers_earlier_frames():
+    async def run():
+        table = {0: {"094": b"a"}, 1: {}, 2: {"094": b"c"}}
+        rows = {0: _done(), 1: _done(), 2: asyncio.get_running_loop().create_future()}
+        return await sw.nearest_tile(1, "094", table, rows)   # row 2 never resolves
+
+    assert asyncio.run(run()) == b"a"
+
+
+def test_nearest_tile_awaits_later_rows():
+    async def run():
+        loop = asyncio.get_running_loop()
+        table = {0: {}, 1: {}, 2: {}}
+        rows = {0: _done(), 1: _done(), 2: loop.create_future()}
+
+        def land():
+            table[2]["094"] = b"c"
+            rows[2].set_result(None)
+
+        loop.call_later(0.01, land)
+        return await sw.nearest_tile(0, "094", table, rows)
+
+    assert asyncio.run(run()) == b"c"
+
+
+def test_nearest_tile_returns_none_when_band_missing_everywhere():
+    async def run():
+        table = {0: {}, 1: {}}
+        return await sw.nearest_tile(0, "094", table, {0: _done(), 1: _done()})
+
+    assert asyncio.run(run()) is None
+
+
+# ─── fetch_rows end to end ──────────────────────────────────────────────────
+STAMPS = ["s20250101T000000Z", "s20250101T001000Z", "s20250101T002000Z"]
+BROKEN = f"or_suvi-l2-ci171_g19_{STAMPS[1]}_e_v1.png"
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    path = request.url.path
+    if path.endswith("/"):
+        band = path.rstrip("/").rsplit("/", 1)[-1]
+        links = "".join(
+            f'<a href="or_suvi-l2-ci{band}_g19_{s}_e_v1.png">x</a>' for s in STAMPS
+        )
+        return httpx.Response(200, text=f"<html>{links}</html>")
+    if path.endswith(BROKEN):
+        return httpx.Response(500)
+    return httpx.Response(200, content=path.encode())
+
+
+@pytest.fixture
+def mock_client(monkeypatch):
+    monkeypatch.setattr(
+        sw, "make_client",
+        lambda concurrency: httpx.AsyncClient(transport=httpx.MockTransport(_handler)),
+    )
+
+
+def _fetch(strict):
+    rows = []
+    asyncio.run(sw.fetch_rows(None, None, 1, strict, 4, rows.append))
+    return rows
+
+
+def test_fetch_rows_gap_fills_failed_tile(mock_client):
+    rows = _fetch(strict=False)
+    assert len(rows) == len(STAMPS)
+    assert all(set(r) == set(sw.GRID_ORDER) for r in rows)
+    assert rows[1]["171"] == rows[0]["171"]                  # filled from frame 0
+    assert rows[1]["094"].endswith(f"{STAMPS[1]}_e_v1.png".encode())
+
+
+def test_fetch_rows_strict_raises(mock_client):
+    with pytest.raises(RuntimeError, match="Give-up"):
+        _fetch(strict=True)
+
+
+
+# ─── single tile downloads ──────────────────────────────────────────────────
+TILE_URL = "https://example.test/suvi/or_suvi-l2-ci094_g19_s20250101T000000Z_e_v1.png"
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    async def instant(delay):
+        pass
+    monkeypatch.setattr(sw.asyncio, "sleep", instant)
+
+
+def _grab(handler, dest, tries=1, strict=False):
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await sw._grab(client, asyncio.Semaphore(1), TILE_URL, dest, tries, strict)
+    return asyncio.run(run())
+
+
+@pytest.fixture
+def cached(tmp_path):
+    dest = tmp_path / "tile.png"
+    dest.write_bytes(b"cached")
+    os.utime(dest, (1_700_000_000, 1_700_000_000))
+    return dest
+
+
+def test_grab_keeps_tile_on_304(cached):
+    def handler(request):
+        assert "if-modified-since" in request.headers
+        return httpx.Response(304)
+
+    assert _grab(handler, cached) == cached
+    assert cached.read_bytes() == b"cached"
+    assert cached.stat().st_mtime == 1_700_000_000
+
+
+def test_grab_retries_mid_body_read_error(tmp_path, no_backoff):
+    class Truncated(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            yield b"half"
+            raise httpx.ReadError("connection reset")
+
+    dest = tmp_path / "tile.png"
+    part = tmp_path / "tile.png.part"
+    calls = []
+
+    def handler(request):
+        calls.append(part.exists())
+        if len(calls) == 1:
+            return httpx.Response(200, stream=Truncated())
+        return httpx.Response(200, content=b"whole")
+
+    assert _grab(handler, dest, tries=2) == dest
+    assert calls == [False, False]                           # no leftover .part
+    assert dest.read_bytes() == b"whole" and not part.exists()
+
+
+def test_grab_ignores_malformed_last_modified(tmp_path):
+    dest = tmp_path / "tile.png"
+    handler = lambda request: httpx.Response(
+        200, content=b"png", headers={"last-modified": "not a date"})
+    assert _grab(handler, dest) == dest
+    assert abs(dest.stat().st_mtime - time.time()) < 60
+
+
+@pytest.mark.parametrize("strict", [False, True])
+def test_grab_falls_back_to_cached_tile(cached, no_backoff, strict):
+    assert _grab(lambda request: httpx.Response(503), cached, tries=2, strict=strict) == cached
+
+    def unreachable(request):
+        raise httpx.ConnectError("offline")
+
+    assert _grab(unreachable, cached, strict=strict) == cached
+    assert cached.read_bytes() == b"cached"
+
+def test_pipeline_stops_downloading_when_encoder_fails(monkeypatch):
+    seen = []
+
+    async def slow(request):
+        seen.append(request.url.path)
+        await asyncio.sleep(0.01)
+        return _handler(request)
+
+    def broken_encoder(rows, args):
+        next(rows)
+        raise FileNotFoundError("ffmpeg")
+
+    monkeypatch.setattr(
+        sw, "make_client",
+        lambda concurrency: httpx.AsyncClient(transport=httpx.MockTransport(slow)),
+    )
+    monkeypatch.setattr(sw, "render", broken_encoder)
+    args = SimpleNamespace(frames=None, retries=1, strict=False, concurrency=1)
+    with pytest.raises(FileNotFoundError):
+        asyncio.run(sw.pipeline(args, None))
+    tiles = [p for p in seen if p.endswith(".png")]
+    assert len(tiles) < len(sw.BANDS) * len(STAMPS)
+
+
+# ─── decoding ───────────────────────────────────────────────────────────────
+@pytest.fixture
+def png16(tmp_path):
+    a = np.array([[0, 255, 40000, 65535]], dtype=np.uint16)
+    path = tmp_path / "tile.png"
+    Image.fromarray(a).save(path)
+    return path
+
+
+@pytest.mark.parametrize("decoder", ["pillow", "vips"])
+def test_open_tile_scales_16_bit_tiles(png16, monkeypatch, decoder):
+    if decoder == "vips":
+        pytest.importorskip("pyvips")
+        if sw.pyvips is None:
+            pytest.skip("libvips not loadable")
+    else:
+        monkeypatch.setattr(sw, "pyvips", None)
+    for tile in (png16, png16.read_bytes()):
+        out = np.asarray(sw.open_tile(tile).convert("RGB"))
+        assert out[0, :, 0].tolist() == [0, 0, 156, 255]
+
+
+# ─── encoding ───────────────────────────────────────────────────────────────
+def test_encode_avi_rejects_mismatched_frame(tmp_path, monkeypatch):
+    procs = []
+
+    class FakeFFmpeg:
+        def __init__(self, cmd, stdin):
+            self.stdin, self.killed = io.BytesIO(), False
+            procs.append(self)
+
+        def kill(self):
+            self.killed = True
+
+        def wait(self):
+            return -9
+
+    monkeypatch.setattr(sw.subprocess, "Popen", FakeFFmpeg)
+    frames = [Image.new("RGB", (4, 4)), Image.new("RGB", (4, 4)), Image.new("RGB", (4, 2))]
+    with pytest.raises(ValueError, match="frame 2 is 4x2, expected 4x4"):
+        sw.encode_avi(frames, tmp_path / "out.avi", fps=10)
+    assert procs[0].killed
+    assert not any(tmp_path.iterdir())